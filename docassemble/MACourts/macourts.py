@@ -10,7 +10,7 @@ from docassemble.base.util import (
 from docassemble.base.legal import Court
 import io, json, re, os, time
 import typing
-from typing import Any, Callable, List, Mapping, Optional, Set, Union, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Union, Tuple
 from docassemble.webapp.playground import PlaygroundSection
 from collections.abc import Iterable
 import copy
@@ -20,6 +20,7 @@ from functools import lru_cache
 # Needed for Boston Municipal Court
 import geopandas as gpd
 from geopandas import GeoDataFrame
+import shapely
 from shapely.geometry import Point
 
 __all__ = [
@@ -41,6 +42,17 @@ def test_write() -> str:
     return fpath
 
 
+@lru_cache(maxsize=1)
+def _reverse_geocoder() -> GoogleV3GeoCoder:
+    """
+    Reuse one initialized geocoder so that its HTTP session and connection pool are kept
+    across reverse geocoding requests. A failed initialization raises and is not cached.
+    """
+    geocoder = GoogleV3GeoCoder(server=server)
+    geocoder.initialize()
+    return geocoder
+
+
 def try_to_populate_county(address: Address, force: bool = False) -> None:
     """
     Jurisdiction depends on exactly matching names for county, city, etc. but we can't ask
@@ -65,8 +77,7 @@ def try_to_populate_county(address: Address, force: bool = False) -> None:
         return
     county = "Unknown"
     try:
-        geocoder = GoogleV3GeoCoder(server=server)
-        geocoder.initialize()
+        geocoder = _reverse_geocoder()
     except:
         address.county = county
         return
@@ -111,15 +122,27 @@ def _is_blank(value: Any) -> bool:
     return False
 
 
+# Place names may be separated by commas, slashes or semicolons
+_place_name_separators = str.maketrans({"/": ",", ";": ","})
+
+_zip_plus4_re = re.compile(r"\b(\d{5})-?\d{4}\b")
+
+
 def _split_place_names(value: Any) -> List[str]:
     if _is_blank(value):
         return []
-    parts = re.split(r"\s*[,/;]\s*", str(value).strip())
+    text = str(value)
+    # Most records have a single place name, which needs no splitting
+    if "," not in text and "/" not in text and ";" not in text:
+        text = text.strip()
+        return [text] if text else []
+    parts = text.translate(_place_name_separators).split(",")
     cleaned = [part.strip() for part in parts if part.strip()]
     # Preserve order while de-duplicating
     return list(dict.fromkeys(cleaned))
 
 
+@lru_cache(maxsize=1024)
 def _normalize_county_name(county_name: str) -> str:
     cleaned = county_name.strip()
     if not cleaned:
@@ -159,6 +182,29 @@ def _load_ma_zip_data() -> Mapping[str, Mapping[str, Any]]:
         return json.load(zip_data_file)
 
 
+def _modified_time(path: str) -> float:
+    """
+    Used as part of the cache key for files that can be edited while the server is running
+    (e.g., in the Playground), so that a changed file is parsed again instead of served stale.
+    """
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+@lru_cache(maxsize=16)
+def _load_courts_json(path: str, modified_time: float) -> List[Mapping[str, Any]]:
+    # Byte-order-marker is not allowed in JSON spec
+    with open(path) as courts_json:
+        return json.load(courts_json)
+
+
+@lru_cache(maxsize=4)
+def _read_geojson(path: str, modified_time: float) -> GeoDataFrame:
+    return gpd.read_file(path)
+
+
 def _zip_code_to_addresses(zip_code: Optional[Union[str, int]]) -> List[Address]:
     normalized_zip = _normalize_zip_code(zip_code)
     if not normalized_zip:
@@ -167,7 +213,7 @@ def _zip_code_to_addresses(zip_code: Optional[Union[str, int]]) -> List[Address]
     record = zip_data.get(normalized_zip)
 
     if record is None and isinstance(zip_code, str):
-        zip_plus4_match = re.search(r"\b(\d{5})-?\d{4}\b", zip_code)
+        zip_plus4_match = _zip_plus4_re.search(zip_code)
         if zip_plus4_match:
             fallback_zip = zip_plus4_match.group(1)
             if fallback_zip != normalized_zip:
@@ -357,11 +403,12 @@ class MACourtList(DAList):
     def get_court_by_code(self, court_code: str) -> Optional[MACourt]:
         """Return a court that has the matching court_code"""
         if isinstance(court_code, str):
+            target_code = court_code.lower()
             return next(
                 (
                     court
                     for court in self
-                    if str(court.court_code).lower() == court_code.lower()
+                    if str(court.court_code).lower() == target_code
                 ),
                 None,
             )
@@ -550,13 +597,14 @@ class MACourtList(DAList):
             # fallback, for running on non-docassemble.
             path = os.path.join(data_path, json_path + ".json")
 
-        # Byte-order-marker is not allowed in JSON spec
-        with open(path) as courts_json:
-            courts = json.load(courts_json)
+        # The parsed file is shared between lists, so copy anything mutable off of it
+        courts = _load_courts_json(path, _modified_time(path))
 
         for item in courts:
             # translate the dictionary data into an MACourtList
             court = self.appendObject()
+            address = item["address"]
+            location = item["location"]
             court.court_code = item.get("court_code")
             court.tyler_code = item.get("tyler_code")
             court.tyler_lower_court_code = item.get("tyler_lower_court_code")
@@ -566,43 +614,40 @@ class MACourtList(DAList):
             court.division = parse_division_from_name(item["name"])
             court.phone = item["phone"]
             court.fax = item["fax"]
-            court.location.latitude = item["location"]["latitude"]
-            court.location.longitude = item["location"]["longitude"]
+            court.location.latitude = location["latitude"]
+            court.location.longitude = location["longitude"]
             court.has_po_box = item.get("has_po_box")
             court.description = item.get("description")
-            court.address.address = item["address"]["address"]
-            court.address.city = item["address"]["city"]
-            court.address.state = item["address"]["state"]
-            court.address.zip = item["address"]["zip"]
-            court.address.county = item["address"]["county"]
-            court.address.orig_address = item["address"].get("orig_address")
-            court.ada_coordinators = item.get("ada_coordinators", [])
+            court.address.address = address["address"]
+            court.address.city = address["city"]
+            court.address.state = address["state"]
+            court.address.zip = address["zip"]
+            court.address.county = address["county"]
+            court.address.orig_address = address.get("orig_address")
+            court.ada_coordinators = copy.deepcopy(item.get("ada_coordinators", []))
 
     def matching_juvenile_court(self, address) -> Set[MACourt]:
         """Returns either single matching MACourt object or a set of MACourts"""
         court_name = self.matching_juvenile_court_name(address)
 
         if isinstance(court_name, Iterable):
-            # Many court names, one address
-            courts = set()
-            for court_item in court_name:
-                courts.update(
-                    set(
-                        [
-                            court
-                            for court in self.elements
-                            if court.name.rstrip().lower() == court_item.lower()
-                        ]
-                    )
-                )
-            return courts
+            # Many court names, one address. Match them all in a single pass over the list
+            target_names = {court_item.lower() for court_item in court_name}
+            return set(
+                [
+                    court
+                    for court in self.elements
+                    if court.name.rstrip().lower() in target_names
+                ]
+            )
         else:  # this branch shouldn't be reached anymore -- we always return a set
             # one court name, which may match more than one court location. Sessions/sittings don't always get unique names
+            target_name = court_name.lower()
             return set(
                 [
                     court
                     for court in self.elements
-                    if court.name.rstrip().lower() == court_name.lower()
+                    if court.name.rstrip().lower() == target_name
                 ]
             )
 
@@ -1136,16 +1181,14 @@ class MACourtList(DAList):
     def matching_probate_and_family_court(self, address) -> Set[MACourt]:
         """Returns either single matching MACourt object or a set of MACourts"""
         court_names = self.matching_probate_and_family_court_name(address)
-        courts = set()
-        for court_item in court_names:
-            courts.update(
-                [
-                    court
-                    for court in self.elements
-                    if court.name.rstrip().lower() == court_item.lower()
-                ]
-            )
-        return courts
+        target_names = {court_item.lower() for court_item in court_names}
+        return set(
+            [
+                court
+                for court in self.elements
+                if court.name.rstrip().lower() in target_names
+            ]
+        )
 
     def matching_probate_and_family_court_name(self, address, depth=0) -> Set[str]:
         """Multiple P&F courts may serve the same address"""
@@ -1660,11 +1703,12 @@ class MACourtList(DAList):
         #         courts.update(set([court for court in self.elements if court.name.rstrip().lower() == court_item.lower()]))
         #     return courts
         # else:
+        target_name = court_name.lower()
         return set(
             [
                 court
                 for court in self.elements
-                if court.name.rstrip().lower() == court_name.lower()
+                if court.name.rstrip().lower() == target_name
             ]
         )
         # return next ((court for court in self.elements if court.name.rstrip().lower() == court_name.lower()), None)
@@ -2168,19 +2212,17 @@ class MACourtList(DAList):
     def matching_district_court(self, address: Address) -> Set[MACourt]:
         """Return list of MACourts representing the District Court(s) serving the given address"""
         court_name = self.matching_district_court_name(address)
-        courts = set()
-        for court_item in court_name:
-            matching_obj = next(
-                (
-                    court
-                    for court in self.elements
-                    if court.name.rstrip().lower() == court_item.lower()
-                ),
-                None,
-            )
-            if matching_obj:
-                courts.add(matching_obj)
-        return courts
+        target_names = {court_item.lower() for court_item in court_name}
+        # Only the first court with each name is used
+        matches: Dict[str, MACourt] = {}
+        for court in self.elements:
+            name = court.name.rstrip().lower()
+            if name in target_names and name not in matches:
+                matches[name] = court
+                # Every name has its court, so nothing later in the list can change the result
+                if len(matches) == len(target_names):
+                    break
+        return set(matches.values())
 
     def matching_district_court_name(self, address: Address, depth=0) -> Set[str]:
         """Returns the name of the MACourt(s) representing the district court that covers the specified address.
@@ -2717,11 +2759,12 @@ class MACourtList(DAList):
     def matching_housing_court(self, address: Address) -> Optional[MACourt]:
         """Return the MACourt representing the Housing Court serving the given address"""
         court_name = self.matching_housing_court_name(address)
+        target_name = court_name.lower()
         return next(
             (
                 court
                 for court in self.elements
-                if court.name.rstrip().lower() == court_name.lower()
+                if court.name.rstrip().lower() == target_name
             ),
             None,
         )
@@ -3242,11 +3285,12 @@ class MACourtList(DAList):
                 )
             except:
                 return None
+        target_name = court_name.lower()
         return next(
             (
                 court
                 for court in self.elements
-                if court.name.rstrip().lower() == court_name.lower()
+                if court.name.rstrip().lower() == target_name
             ),
             None,
         )
@@ -3254,7 +3298,8 @@ class MACourtList(DAList):
     def load_boston_wards_from_file(
         self, json_path, data_path: Optional[str] = None
     ) -> GeoDataFrame:
-        """load geojson file for boston wards"""
+        """load geojson file for boston wards. The parsed file is cached and shared between
+        calls, so callers should not modify the returned GeoDataFrame in place."""
         if data_path is None:
             if hasattr(self, "data_path"):
                 data_path = self.data_path
@@ -3266,7 +3311,7 @@ class MACourtList(DAList):
         if path is None:
             # fallback, for running on non-docassemble (i.e. unit tests)
             path = os.path.join(self.data_path, json_path + ".geojson")
-        wards = gpd.read_file(path)
+        wards = _read_geojson(path, _modified_time(path))
 
         return wards
 
@@ -3300,10 +3345,8 @@ class MACourtList(DAList):
             # load geojson Boston Ward map
             boston_wards = self.load_boston_wards_from_file(json_path="boston_wards")
 
-            # find ward containing point object
-            ward = boston_wards[
-                [p1.within(boston_wards.geometry[i]) for i in range(len(boston_wards))]
-            ]
+            # find ward containing point object, testing every ward in one vectorized call
+            ward = boston_wards[boston_wards.geometry.contains(p1)]
 
             # if result exists, return result
             if len(ward) > 0:
@@ -3314,15 +3357,14 @@ class MACourtList(DAList):
 
             # else find closest ward and return result
             else:
-                distances_to_wards = [
-                    p1.distance(boston_wards.iloc[i].geometry)
-                    for i in range(len(boston_wards))
-                ]
-                mask = [i == min(distances_to_wards) for i in distances_to_wards]
-                ward = boston_wards[mask]
+                # measure every ward in one vectorized call; argmin picks the first closest ward
+                distances_to_wards = shapely.distance(
+                    boston_wards.geometry.to_numpy(), p1
+                )
+                ward = boston_wards.iloc[distances_to_wards.argmin()]
 
-                ward_number = ward.iloc[0].Ward_Num
-                courthouse_name = ward.iloc[0].courthouse
+                ward_number = ward.Ward_Num
+                courthouse_name = ward.courthouse
 
                 return ward_number, courthouse_name
 
@@ -3473,10 +3515,11 @@ class MACourtList(DAList):
                         return [court]
                 for key, name in self._appellate_court_code_dict.items():
                     if key in docket_number.upper():
+                        target_name = name.lower()
                         matching_courts = [
                             court
                             for court in self.elements
-                            if name.lower() in court.name.rstrip().lower()
+                            if target_name in court.name.rstrip().lower()
                         ]
                         if matching_courts:
                             return matching_courts
@@ -3495,10 +3538,11 @@ class MACourtList(DAList):
                 search_court_code = self._alt_court_codes[court_code.upper()]
             else:
                 search_court_code = court_code
+            target_code = str(search_court_code).lower()
             matching_courts = [
                 court
                 for court in self.elements
-                if court.court_code.strip().lower() == str(search_court_code).lower()
+                if court.court_code.strip().lower() == target_code
             ]
             if not matching_courts:
                 raise KeyError(
@@ -3557,18 +3601,18 @@ class MACourtList(DAList):
             # identify_court_name function re check_proper_format and variations.
         else:
             if "probate" in court.name.lower():
-                for key in self._probate_family_court_case_type_code_dict:
-                    if key == case_type_code:
-                        return self._probate_family_court_case_type_code_dict[key]
+                if case_type_code in self._probate_family_court_case_type_code_dict:
+                    return self._probate_family_court_case_type_code_dict[
+                        case_type_code
+                    ]
                 raise Exception
 
             # Case-type identification separates Probate and Family Court from other
             # courts because 'AD' refers to 'Adoption' in Probate and Family Court
             # while it refers to 'Appeal' in others.
             else:
-                for key in self._court_case_type_code_dict:
-                    if key == case_type_code:
-                        return self._court_case_type_code_dict[key]
+                if case_type_code in self._court_case_type_code_dict:
+                    return self._court_case_type_code_dict[case_type_code]
                 raise Exception
                 # The docket number has incorrect (nonexistent) case-type code.
 
@@ -3605,18 +3649,25 @@ def get_sequence_number_from_docket_number(docket_number: str) -> Optional[str]:
     return search.group() if search else None
 
 
+# Keyed by text that must appear in the name for the rule to match
+_division_rules = {
+    " District Court": re.compile(r"(.*)( District Court)"),
+    ", Boston Municipal Court": re.compile(r"(.*)(, Boston Municipal Court)"),
+    " Housing Court": re.compile(r"(.*)( Housing Court)"),
+    " Superior Court": re.compile(r"(.*)( Superior Court)"),
+    " Juvenile Court": re.compile(r"(.*)( Juvenile Court)"),
+    "Land Court": re.compile(r"(Land Court)"),
+    " Probate and Family Court": re.compile(r"(.*)( Probate and Family Court)"),
+}
+
+
+@lru_cache(maxsize=1024)
 def parse_division_from_name(court_name) -> str:
-    rules = {
-        "District Court": r"(.*)( District Court)",
-        "Boston Municipal Court": r"(.*)(, Boston Municipal Court)",
-        "Housing Court": r"(.*)( Housing Court)",
-        "Superior Court": r"(.*)( Superior Court)",
-        "Juvenile Court": r"(.*)( Juvenile Court)",
-        "Land Court": r"(Land Court)",
-        "Probate and Family": r"(.*)( Probate and Family Court)",
-    }
-    for key in rules:
-        match = re.match(rules[key], court_name)
+    for required_text, rule in _division_rules.items():
+        # Most rules can't match, and a substring check is much cheaper than the regex
+        if required_text not in court_name:
+            continue
+        match = rule.match(court_name)
         if match:
             return match[1]  # We need to make sure the regex has a group though
             # if len(match) > 1:
@@ -3660,38 +3711,27 @@ def combined_locations(locations):
     """
 
     places = list()
+    # Each place, keyed by its rounded position
+    places_by_position: Dict[Tuple[float, float], MAPlace] = dict()
 
-    def has_match(locations, other) -> bool:
-        for item in locations:
-            if match(item, other):
-                return True
-        return False
-
-    def match(item, other) -> bool:
-        if not item is None and not other is None:
-            return round(item.location.latitude, 3) == round(
-                other.location.latitude, 3
-            ) and round(item.location.longitude, 3) == round(
-                other.location.longitude, 3
-            )
-        return False
+    def rounded_position(item) -> Tuple[float, float]:
+        return (round(item.location.latitude, 3), round(item.location.longitude, 3))
 
     for location in locations:
         if isinstance(location, DAObject):
-            if not has_match(places, location):
-                places.append(
-                    MAPlace(
-                        location=location.location,
-                        address=copy.deepcopy(location.address),
-                        description=str(location),
-                    )
+            position = rounded_position(location)
+            place = places_by_position.get(position)
+            if place is None:
+                place = MAPlace(
+                    location=location.location,
+                    address=copy.deepcopy(location.address),
+                    description=str(location),
                 )
-            else:
-                for place in places:
-                    if match(place, location):
-                        if (
-                            hasattr(place, "description")
-                            and str(location) not in place.description
-                        ):
-                            place.description += "  [NEWLINE]  " + str(location)
+                places.append(place)
+                places_by_position[position] = place
+            elif (
+                hasattr(place, "description")
+                and str(location) not in place.description
+            ):
+                place.description += "  [NEWLINE]  " + str(location)
     return places
@@ -5,7 +5,7 @@ import unittest
 from hypothesis import given, strategies as st
 from docassemble.base.util import Address, LatitudeLongitude
 
-from ..macourts import MACourtList
+from ..macourts import MACourtList, parse_division_from_name
 
 
 class TestCourtFinder(unittest.TestCase):
@@ -97,6 +97,21 @@ class TestCourtFinder(unittest.TestCase):
         self.assertEqual(len(court_list), 1)
         self.assertEqual(court_list[0].name, "Brockton District Court")
 
+    def test_parse_division_from_name(self):
+        self.assertEqual(parse_division_from_name("Attleboro District Court"), "Attleboro")
+        self.assertEqual(
+            parse_division_from_name("Brighton Division, Boston Municipal Court"),
+            "Brighton Division",
+        )
+        self.assertEqual(
+            parse_division_from_name("Barnstable Probate and Family Court"),
+            "Barnstable",
+        )
+        self.assertEqual(parse_division_from_name("Land Court"), "Land Court")
+        self.assertEqual(
+            parse_division_from_name("Supreme Judicial Court"), "Supreme Judicial Court"
+        )
+
 
     def test_random_points(self):
         # previously generated 65 random points that were within the state, and turned those into these addresses
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import json
-import math
 from pathlib import Path
 
 import pgeocode
@@ -19,32 +18,26 @@ def main() -> None:
 
     nomi = pgeocode.Nominatim("us")
     data = nomi._data
-    ma_rows = data[data["state_code"] == "MA"].copy()
-
-    def normalize_value(value):
-        if isinstance(value, float) and math.isnan(value):
-            return None
-        return value
-
-    records = {}
-    for row in ma_rows.itertuples(index=False):
-        postal_code = getattr(row, "postal_code", None)
-        if not postal_code or str(postal_code) == "nan":
-            continue
-        postal_code = str(postal_code)
-        records[postal_code] = {
-            "place_name": normalize_value(getattr(row, "place_name", None)),
-            "county_name": normalize_value(getattr(row, "county_name", None)),
-            "latitude": normalize_value(getattr(row, "latitude", None)),
-            "longitude": normalize_value(getattr(row, "longitude", None)),
-        }
+    columns = ["place_name", "county_name", "latitude", "longitude"]
+    ma_rows = data.loc[data["state_code"] == "MA", ["postal_code", *columns]]
+
+    postal_codes = ma_rows["postal_code"].astype(str)
+    has_postal_code = ma_rows["postal_code"].notna() & ~postal_codes.isin(["", "nan"])
+    ma_rows = ma_rows[has_postal_code]
+
+    # Replace NaN with None column by column rather than cell by cell
+    values = ma_rows[columns].astype(object)
+    values = values.where(values.notna(), None)
+    records = dict(
+        zip(postal_codes[has_postal_code], values.to_dict(orient="records"))
+    )
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as outfile:
-        json.dump(
-            {k: records[k] for k in sorted(records)}, outfile, indent=2, sort_keys=False
-        )
-        outfile.write("\n")
+    # Serialize in one call and write once instead of streaming many small chunks
+    output = json.dumps(
+        {k: records[k] for k in sorted(records)}, indent=2, sort_keys=False
+    )
+    output_path.write_text(output + "\n", encoding="utf-8")
 
     print(f"Wrote {len(records)} MA zip code records to {output_path}")
 